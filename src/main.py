@@ -1,9 +1,18 @@
 import os
+import logging
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-load_dotenv()
+# Production injects env vars directly; no .env to scan for
+if os.getenv("ENVIRONMENT") != "production":
+    load_dotenv()
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
+import httpx
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 from src.routers import websocket
@@ -16,7 +25,16 @@ from src.auth.config import AUTH_ENABLED
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print(f"Auth {'ENABLED' if AUTH_ENABLED else 'DISABLED'}")
-    yield
+    # Shared HTTP client so outbound calls (Google OAuth) reuse pooled connections
+    app.state.http = httpx.AsyncClient(
+        timeout=10.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
 
 
 app = FastAPI(
@@ -27,7 +45,11 @@ app = FastAPI(
 )
 
 # CORS configuration
-origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+origins = tuple(
+    o.strip()
+    for o in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if o.strip()
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -6,8 +6,7 @@ Endpoints: /auth/google/login, /auth/google/callback, /auth/me
 import secrets
 from urllib.parse import urlencode, urlparse, parse_qs
 
-import httpx
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 
 from auth.config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, AUTH_ENABLED
@@ -53,6 +52,7 @@ async def google_login(
 
 @router.get("/google/callback")
 async def google_callback(
+    request: Request,
     code: str = Query(...),
     state: str = Query(default=""),
 ):
@@ -67,36 +67,36 @@ async def google_callback(
     # Determine callback URL (must match what was used in /login)
     callback_url = "http://localhost:8000/auth/google/callback"
 
-    # Exchange code for tokens
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            GOOGLE_TOKEN_URL,
-            data={
-                "code": code,
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "redirect_uri": callback_url,
-                "grant_type": "authorization_code",
-            },
+    # Exchange code for tokens (app-scoped client keeps the TLS session to Google warm)
+    client = request.app.state.http
+    token_resp = await client.post(
+        GOOGLE_TOKEN_URL,
+        data={
+            "code": code,
+            "client_id": GOOGLE_CLIENT_ID,
+            "client_secret": GOOGLE_CLIENT_SECRET,
+            "redirect_uri": callback_url,
+            "grant_type": "authorization_code",
+        },
+    )
+    if token_resp.status_code != 200:
+        return JSONResponse(
+            {"error": "Token exchange failed", "detail": token_resp.text},
+            status_code=400,
         )
-        if token_resp.status_code != 200:
-            return JSONResponse(
-                {"error": "Token exchange failed", "detail": token_resp.text},
-                status_code=400,
-            )
-        tokens = token_resp.json()
-
-        # Get user info
-        userinfo_resp = await client.get(
-            GOOGLE_USERINFO_URL,
-            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    tokens = token_resp.json()
+
+    # Get user info
+    userinfo_resp = await client.get(
+        GOOGLE_USERINFO_URL,
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    if userinfo_resp.status_code != 200:
+        return JSONResponse(
+            {"error": "Failed to get user info"},
+            status_code=400,
         )
-        if userinfo_resp.status_code != 200:
-            return JSONResponse(
-                {"error": "Failed to get user info"},
-                status_code=400,
-            )
-        userinfo = userinfo_resp.json()
+    userinfo = userinfo_resp.json()
 
     # Upsert user in Supabase
     user = upsert_user(
@@ -1,12 +1,24 @@
 """
 Speech-to-Text routers package.
+
+Providers are imported only when enabled via STT_PROVIDERS
+(comma-separated, defaults to all), so unused provider SDKs never load.
 """
 
+import os
+import importlib
 from fastapi import APIRouter
-from .speechmatics import router as speechmatics_router
-from .elevenlabs import router as elevenlabs_router
+
+PROVIDERS = ("speechmatics", "elevenlabs")
+
 router = APIRouter()
 
 # Mount provider routers
-router.include_router(speechmatics_router, prefix="/speechmatics", tags=["speechmatics"])
-router.include_router(elevenlabs_router, prefix="/elevenlabs", tags=["elevenlabs"])
\ No newline at end of file
+for provider in os.getenv("STT_PROVIDERS", ",".join(PROVIDERS)).split(","):
+    provider = provider.strip()
+    if not provider:
+        continue
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown STT provider '{provider}'. Available: {', '.join(PROVIDERS)}")
+    module = importlib.import_module(f".{provider}", __name__)
+    router.include_router(module.router, prefix=f"/{provider}", tags=[provider])
@@ -2,16 +2,25 @@
 ElevenLabs Scribe v2 Speech-to-Text WebSocket handler.
 Uses the same confirmed/partial translation pipeline as the Speechmatics router.
 Endpoint: /stt/elevenlabs
+
+Audio may arrive as binary frames (raw 16 kHz PCM) or as JSON
+{"type": "audio_chunk", "audio_base_64": ...}; control messages stay JSON.
+Pass ?batch=1 to receive bursts of outbound messages as {"type": "batch", "items": [...]},
+and ?binary=1 to receive transcript/translation messages as binary JSON frames.
 """
 
 import os
-import json
+import ssl
 import time
+import base64
 import asyncio
+import logging
+import orjson
 import websockets
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from utils.tone import ToneDetector
 from utils.speaker_pipeline import SpeakerPipeline
+from utils.ws_writer import WebSocketWriter, send_json
 from auth.config import AUTH_ENABLED
 from auth.dependencies import require_ws_auth
 
@@ -20,6 +29,18 @@ router = APIRouter()
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 ELEVENLABS_URL = "wss://api.elevenlabs.io/v1/speech-to-text/realtime?model_id=scribe_v2_realtime"
 CONNECTION_TIMEOUT = 10.0
+AUDIO_FLUSH_BYTES = 3200  # 100 ms of 16 kHz s16le PCM per upstream frame
+# One TLS context for every upstream connect so the CA bundle is loaded once, not per session
+_SSL_CONTEXT = ssl.create_default_context()
+
+logger = logging.getLogger(__name__)
+
+# Frames for the PCM we base64-encode ourselves are built from pre-serialized pieces;
+# the payload is guaranteed base64, so it can be spliced in without escaping. Kept as
+# bytes and sent with text=True, so websockets skips the str -> UTF-8 encode.
+_AUDIO_PREFIX = b'{"message_type":"input_audio_chunk","audio_base_64":"'
+_AUDIO_SUFFIX = b'","commit":false,"sample_rate":16000}'
+_COMMIT_FRAME = b'{"message_type":"input_audio_chunk","audio_base_64":"","commit":true,"sample_rate":16000}'
 
 
 @router.websocket("")
@@ -30,7 +51,7 @@ async def stream(ws: WebSocket):
         return
 
     if not ELEVENLABS_API_KEY:
-        await ws.send_json({"type": "error", "message": "ELEVENLABS_API_KEY not configured"})
+        await send_json(ws, {"type": "error", "message": "ELEVENLABS_API_KEY not configured"})
         await ws.close()
         return
 
@@ -45,6 +66,11 @@ async def stream(ws: WebSocket):
     use_realtime = translator_type == "realtime"
     use_deepl = translator_type == "deepl"
     tone_detector = ToneDetector(target_lang=target_lang)
+    writer = WebSocketWriter(
+        ws,
+        batch=ws.query_params.get("batch", "0") == "1",
+        binary=ws.query_params.get("binary", "0") == "1",
+    )
 
     committed_text = ""
     current_partial = ""
@@ -55,23 +81,23 @@ async def stream(ws: WebSocket):
 
     async def on_confirmed(text, elapsed_ms=0):
         if not closed:
-            await ws.send_json({"type": "confirmed_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
+            writer.send({"type": "confirmed_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
 
     async def on_partial(text, elapsed_ms=0):
         if not closed:
-            await ws.send_json({"type": "partial_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
+            writer.send({"type": "partial_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
 
     async def on_confirmed_transcript(text, elapsed_ms=0):
         if not closed:
-            await ws.send_json({"type": "confirmed_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
+            writer.send({"type": "confirmed_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
 
     async def on_partial_transcript(text, elapsed_ms=0):
         if not closed:
-            await ws.send_json({"type": "partial_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
+            writer.send({"type": "partial_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
 
     async def on_partial_delta(delta, generation, elapsed_ms=0):
         if not closed:
-            await ws.send_json({"type": "partial_translation_delta", "speaker": speaker_id, "delta": delta, "generation": generation, "elapsed_ms": elapsed_ms})
+            writer.send({"type": "partial_translation_delta", "speaker": speaker_id, "delta": delta, "generation": generation, "elapsed_ms": elapsed_ms})
 
     pipeline = SpeakerPipeline(
         speaker_id=speaker_id,
@@ -91,74 +117,94 @@ async def stream(ws: WebSocket):
     )
 
     async def forward_audio(elevenlabs_ws):
+        nonlocal stream_ending
+        # Binary PCM is coalesced so small client frames don't each cost an upstream frame
+        pcm_buffer = bytearray()
+
+        async def flush_pcm():
+            if pcm_buffer:
+                await elevenlabs_ws.send(_AUDIO_PREFIX + base64.b64encode(pcm_buffer) + _AUDIO_SUFFIX, text=True)
+                pcm_buffer.clear()
+
         try:
             while True:
+                # Generic receive() since audio may be binary or JSON text
                 message = await ws.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                # Binary frame: raw PCM from the client, base64-encoded once per flush for ElevenLabs
+                if message.get("bytes"):
+                    pcm_buffer += message["bytes"]
+                    if len(pcm_buffer) >= AUDIO_FLUSH_BYTES:
+                        await flush_pcm()
+                    continue
+
                 if "text" not in message:
                     continue
 
-                data = json.loads(message["text"])
+                data = orjson.loads(message["text"])
                 msg_type = data.get("type")
 
                 if msg_type == "audio_chunk":
-                    await elevenlabs_ws.send(json.dumps({
+                    await flush_pcm()
+                    # Client-supplied payload: let orjson escape it rather than splicing it into the envelope
+                    await elevenlabs_ws.send(orjson.dumps({
                         "message_type": "input_audio_chunk",
                         "audio_base_64": data.get("audio_base_64", ""),
                         "commit": False,
                         "sample_rate": 16000,
-                    }))
+                    }), text=True)
                 elif msg_type == "end_stream":
-                    print("Stream ending, sending final commit")
+                    logger.info("Stream ending, sending final commit")
                     stream_ending = True
-                    await elevenlabs_ws.send(json.dumps({
-                        "message_type": "input_audio_chunk",
-                        "audio_base_64": "",
-                        "commit": True,
-                        "sample_rate": 16000,
-                    }))
+                    await flush_pcm()
+                    await elevenlabs_ws.send(_COMMIT_FRAME, text=True)
                     break
 
         except WebSocketDisconnect:
             pass
         except Exception as e:
-            print(f"forward_audio error: {type(e).__name__}: {e}")
+            logger.error("forward_audio error: %s: %s", type(e).__name__, e)
 
     async def forward_transcripts(elevenlabs_ws):
         """Forward transcripts from ElevenLabs to client and process for translation"""
         nonlocal committed_text, current_partial, prev_partial, closed
 
         try:
-            async for message in elevenlabs_ws:
-                data = json.loads(message)
+            while True:
+                # Raw bytes: orjson validates UTF-8 while parsing, so skip websockets' decode pass
+                data = orjson.loads(await elevenlabs_ws.recv(decode=False))
                 msg_type = data.get("message_type", "")
                 text = data.get("text", "").strip()
 
                 if msg_type == "committed_transcript":
                     if text:
-                        committed_text = (committed_text + " " + text).strip() if committed_text else text
+                        committed_text = f"{committed_text} {text}" if committed_text else text
                         if committed_text != prev_partial:
                             prev_partial = committed_text
                             pipeline.feed(committed_text)
 
                     if stream_ending:
-                        print("Stream ended")
-                        print(f"   Source confirmed: {pipeline.prev_text}")
-                        print(f"   Translated confirmed: {pipeline.translator.translated_confirmed}")
-                        print(f"   Translated partial: {pipeline.translator.translated_partial}")
+                        logger.info("Stream ended")
+                        logger.debug("   Source confirmed: %s", pipeline.prev_text)
+                        logger.debug("   Translated confirmed: %s", pipeline.translator.translated_confirmed)
+                        logger.debug("   Translated partial: %s", pipeline.translator.translated_partial)
                         break
 
                 elif msg_type == "partial_transcript":
-                    current_partial = (committed_text + " " + text).strip() if committed_text else text
+                    # Both parts are already stripped, so join without a second .strip() copy
+                    current_partial = f"{committed_text} {text}" if committed_text and text else committed_text or text
                     if current_partial and current_partial != prev_partial:
                         prev_partial = current_partial
                         pipeline.feed(current_partial)
                         if not closed:
-                            await ws.send_json({"type": "partial", "text": current_partial})
+                            writer.send({"type": "partial", "text": current_partial})
 
         except websockets.ConnectionClosed:
             pass
         except Exception as e:
-            print(f"forward_transcripts error: {type(e).__name__}: {e}")
+            logger.error("forward_transcripts error: %s: %s", type(e).__name__, e)
 
     elevenlabs_ws = None
 
@@ -167,29 +213,41 @@ async def stream(ws: WebSocket):
             websockets.connect(
                 ELEVENLABS_URL,
                 additional_headers={"xi-api-key": ELEVENLABS_API_KEY},
+                ssl=_SSL_CONTEXT,
+                compression=None,  # PCM audio doesn't deflate; skip zlib per frame
             ),
             timeout=CONNECTION_TIMEOUT,
         )
 
-        session_msg = await elevenlabs_ws.recv()
-        session_data = json.loads(session_msg)
-        await ws.send_json({"type": "session_started", "data": session_data})
+        session_msg = await elevenlabs_ws.recv(decode=False)
+        session_data = orjson.loads(session_msg)
+        await send_json(ws, {"type": "session_started", "data": session_data})
+        writer.start()
 
-        await asyncio.gather(
-            forward_audio(elevenlabs_ws),
-            forward_transcripts(elevenlabs_ws),
-        )
+        # Whichever side finishes first tears the other down, except that after end_stream
+        # the transcript side keeps running until the final committed transcript arrives
+        async with asyncio.TaskGroup() as tg:
+            audio_task = tg.create_task(forward_audio(elevenlabs_ws))
+            transcripts_task = tg.create_task(forward_transcripts(elevenlabs_ws))
+
+            def on_audio_done(_):
+                if not stream_ending:
+                    transcripts_task.cancel()
+
+            audio_task.add_done_callback(on_audio_done)
+            transcripts_task.add_done_callback(lambda _: audio_task.cancel())
 
     except asyncio.TimeoutError:
-        await ws.send_json({"type": "error", "message": "ElevenLabs connection timeout"})
+        await send_json(ws, {"type": "error", "message": "ElevenLabs connection timeout"})
     except websockets.InvalidStatusCode as e:
-        print(f"ElevenLabs connection failed: {e}")
-        await ws.send_json({"type": "error", "message": str(e)})
+        logger.error("ElevenLabs connection failed: %s", e)
+        await send_json(ws, {"type": "error", "message": str(e)})
     except WebSocketDisconnect:
-        print("Disconnected")
+        logger.info("Disconnected")
     except Exception as e:
-        print(f"{type(e).__name__}: {e}")
+        logger.error("%s: %s", type(e).__name__, e)
     finally:
         closed = True
+        await writer.close()
         if elevenlabs_ws:
             await elevenlabs_ws.close()
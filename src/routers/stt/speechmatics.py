@@ -1,8 +1,20 @@
+"""
+Speechmatics real-time Speech-to-Text WebSocket handler with per-speaker pipelines.
+Endpoint: /stt/speechmatics
+
+Audio may arrive as binary frames (raw 16 kHz PCM) or as JSON
+{"type": "audio_chunk", "audio_base_64": ...}; control messages stay JSON.
+Pass ?batch=1 to receive bursts of outbound messages as {"type": "batch", "items": [...]},
+and ?binary=1 to receive transcript/translation messages as binary JSON frames.
+"""
+
 import os
-import json
-import base64
 import time
 import asyncio
+import logging
+import orjson
+from functools import lru_cache, partial
+from binascii import a2b_base64
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from speechmatics.rt import (
     AsyncClient,
@@ -14,12 +26,37 @@ from speechmatics.rt import (
 )
 from utils.tone import ToneDetector
 from utils.speaker_pipeline import SpeakerPipeline
+from utils.ws_writer import WebSocketWriter
 from auth.config import AUTH_ENABLED
 from auth.dependencies import require_ws_auth
 
 router = APIRouter()
 
 SPEECHMATICS_API_KEY = os.getenv("SPEECHMATICS_API_KEY")
+AUDIO_CHUNK_BYTES = 4096  # binary PCM is forwarded in whole multiples of this (128 ms at 16 kHz s16le)
+PARTIAL_DEBOUNCE_SEC = 0.1  # partials arriving faster than this are coalesced, latest wins
+TRIM_CONFIRMED_WORDS = 200  # once this many words are confirmed, drop them from the speaker's text
+
+logger = logging.getLogger(__name__)
+
+# Identical for every connection, so encoded once
+_SESSION_STARTED = orjson.dumps({"type": "session_started", "data": {"status": "connected"}}).decode()
+
+# Session configs are read-only once built (the SDK only serializes them), so share them across connections
+_AUDIO_FORMAT = AudioFormat(encoding="pcm_s16le", chunk_size=AUDIO_CHUNK_BYTES, sample_rate=16000)
+
+
+@lru_cache(maxsize=32)
+def _transcription_config(language: str) -> TranscriptionConfig:
+    return TranscriptionConfig(
+        language=language,
+        enable_partials=True,
+        operating_point=OperatingPoint.ENHANCED,
+        diarization="speaker",
+        speaker_diarization_config={
+            "max_speakers": 10
+        }
+    )
 
 
 @router.websocket("")
@@ -30,6 +67,7 @@ async def stream(ws: WebSocket):
         return
 
     closed = False
+    loop = asyncio.get_running_loop()
     target_lang = ws.query_params.get("target_lang", "Korean")
     source_lang = ws.query_params.get("source_lang", "en")
     aggressiveness = int(ws.query_params.get("aggressiveness", "1"))
@@ -40,6 +78,11 @@ async def stream(ws: WebSocket):
     use_realtime = translator_type == "realtime"
     use_deepl = translator_type == "deepl"
     tone_detector = ToneDetector(target_lang=target_lang)
+    writer = WebSocketWriter(
+        ws,
+        batch=ws.query_params.get("batch", "0") == "1",
+        binary=ws.query_params.get("binary", "0") == "1",
+    )
 
     stream_start = time.time()
 
@@ -47,34 +90,23 @@ async def stream(ws: WebSocket):
     speaker_accumulated: dict[str, str] = {}
     pipelines: dict[str, SpeakerPipeline] = {}
 
-    def get_or_create_pipeline(speaker_id: str) -> SpeakerPipeline:
-        if speaker_id not in pipelines:
-            async def on_confirmed(text, elapsed_ms=0):
-                if not closed:
-                    await ws.send_json({"type": "confirmed_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
-
-            async def on_partial(text, elapsed_ms=0):
-                if not closed:
-                    await ws.send_json({"type": "partial_translation", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
+    # Pipeline callbacks: one pair of senders, bound per speaker with functools.partial
+    async def send_text(msg_type, speaker_id, text, elapsed_ms=0):
+        if not closed:
+            writer.send({"type": msg_type, "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
 
-            async def on_confirmed_transcript(text, elapsed_ms=0):
-                if not closed:
-                    await ws.send_json({"type": "confirmed_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
-
-            async def on_partial_transcript(text, elapsed_ms=0):
-                if not closed:
-                    await ws.send_json({"type": "partial_transcript", "speaker": speaker_id, "text": text, "elapsed_ms": elapsed_ms})
-
-            async def on_partial_delta(delta, generation, elapsed_ms=0):
-                if not closed:
-                    await ws.send_json({"type": "partial_translation_delta", "speaker": speaker_id, "delta": delta, "generation": generation, "elapsed_ms": elapsed_ms})
+    async def send_delta(speaker_id, delta, generation, elapsed_ms=0):
+        if not closed:
+            writer.send({"type": "partial_translation_delta", "speaker": speaker_id, "delta": delta, "generation": generation, "elapsed_ms": elapsed_ms})
 
+    def get_or_create_pipeline(speaker_id: str) -> SpeakerPipeline:
+        if speaker_id not in pipelines:
             pipelines[speaker_id] = SpeakerPipeline(
                 speaker_id=speaker_id,
-                on_confirmed=on_confirmed,
-                on_partial=on_partial,
-                on_confirmed_transcript=on_confirmed_transcript,
-                on_partial_transcript=on_partial_transcript,
+                on_confirmed=partial(send_text, "confirmed_translation", speaker_id),
+                on_partial=partial(send_text, "partial_translation", speaker_id),
+                on_confirmed_transcript=partial(send_text, "confirmed_transcript", speaker_id),
+                on_partial_transcript=partial(send_text, "partial_transcript", speaker_id),
                 target_lang=target_lang,
                 tone_detector=tone_detector,
                 stream_start=stream_start,
@@ -83,7 +115,7 @@ async def stream(ws: WebSocket):
                 partial_interval=partial_interval,
                 use_realtime=use_realtime,
                 use_deepl=use_deepl,
-                on_partial_delta=on_partial_delta,
+                on_partial_delta=partial(send_delta, speaker_id),
             )
         return pipelines[speaker_id]
 
@@ -91,28 +123,30 @@ async def stream(ws: WebSocket):
 
     def parse_speaker_texts(results):
         """Parse per-speaker text from Speechmatics results."""
-        texts: dict[str, str] = {}
+        # Tokens per speaker, joined once at the end; punctuation attaches to the previous token
+        tokens: dict[str, list[str]] = {}
         for r in results:
             if r.get("type") not in ("word", "punctuation"):
                 continue
             content = r["alternatives"][0]["content"]
             speaker = r["alternatives"][0].get("speaker", "unknown")
-            if speaker not in texts:
-                texts[speaker] = ""
-            if r["type"] == "punctuation":
-                texts[speaker] = texts[speaker].rstrip() + content
+            parts = tokens.setdefault(speaker, [])
+            if r["type"] == "punctuation" and parts:
+                parts[-1] = parts[-1].rstrip() + content
             else:
-                texts[speaker] += (" " + content) if texts[speaker] else content
-        return texts
+                parts.append(content)
+        return {speaker: " ".join(parts) for speaker, parts in tokens.items()}
 
     def print_speaker_texts(partial_results=None):
-        """Print accumulated + current partial per speaker."""
+        """Log accumulated + current partial per speaker at DEBUG."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         merged = {s: t for s, t in speaker_accumulated.items()}
         if partial_results:
             for speaker, text in parse_speaker_texts(partial_results).items():
                 merged[speaker] = (merged.get(speaker, "") + " " + text).strip()
         for speaker in sorted(merged):
-            print(f"  🎤 {speaker}: {merged[speaker]}")
+            logger.debug("  🎤 %s: %s", speaker, merged[speaker])
 
     def get_speaker_full_texts(partial_results=None):
         """Get accumulated + partial text per speaker for feeding into pipelines."""
@@ -127,8 +161,32 @@ async def stream(ws: WebSocket):
     client = AsyncClient(api_key=SPEECHMATICS_API_KEY)
     await client.__aenter__()
 
+    # ---- Partial debounce ----
+
+    pending_partial = None  # latest partial message waiting out the debounce window
+    partial_flush: asyncio.TimerHandle | None = None
+    last_partial_ts = 0.0
+
+    def cancel_pending_partial():
+        nonlocal pending_partial, partial_flush
+        pending_partial = None
+        if partial_flush:
+            partial_flush.cancel()
+            partial_flush = None
+
+    def flush_partial():
+        nonlocal pending_partial, partial_flush, last_partial_ts
+        msg = pending_partial
+        pending_partial = None
+        partial_flush = None
+        if msg is not None:
+            last_partial_ts = loop.time()
+            process_partial(msg)
+
     @client.on(ServerMessageType.ADD_TRANSCRIPT)
     def on_final(msg):
+        # A final supersedes any partial still waiting, which would re-add words it now contains
+        cancel_pending_partial()
         results = msg.get("results", [])
         parsed = parse_speaker_texts(results)
         for speaker, text in parsed.items():
@@ -136,12 +194,27 @@ async def stream(ws: WebSocket):
 
         # Feed each speaker's full text into their pipeline
         for speaker, full_text in speaker_accumulated.items():
-            get_or_create_pipeline(speaker).feed(full_text)
+            pipeline = get_or_create_pipeline(speaker)
+            pipeline.feed(full_text)
+            # Keep per-speaker text bounded on long sessions; confirmed words are never re-read
+            if pipeline.confirmed_word_count >= TRIM_CONFIRMED_WORDS:
+                speaker_accumulated[speaker] = pipeline.trim(full_text)
 
         # print_speaker_texts()
 
     @client.on(ServerMessageType.ADD_PARTIAL_TRANSCRIPT)
     def on_partial(msg):
+        nonlocal pending_partial, partial_flush
+        pending_partial = msg
+        delay = PARTIAL_DEBOUNCE_SEC - (loop.time() - last_partial_ts)
+        if delay <= 0:
+            if partial_flush:
+                partial_flush.cancel()
+            flush_partial()
+        elif partial_flush is None:
+            partial_flush = loop.call_later(delay, flush_partial)
+
+    def process_partial(msg):
         results = msg.get("results", [])
         full_texts = get_speaker_full_texts(results)
         # print_speaker_texts(results)
@@ -153,42 +226,63 @@ async def stream(ws: WebSocket):
         # Send raw partial transcript to frontend
         transcript = TranscriptResult.from_message(msg).metadata.transcript or ""
         if transcript and not closed:
-            loop = asyncio.get_event_loop()
-            loop.create_task(ws.send_json({"type": "partial", "text": transcript}))
+            writer.send({"type": "partial", "text": transcript})
 
     try:
         await client.start_session(
-            transcription_config=TranscriptionConfig(
-                language=source_lang,
-                enable_partials=True,
-                operating_point=OperatingPoint.ENHANCED,
-                diarization="speaker",
-                speaker_diarization_config={
-                    "max_speakers": 10
-                }
-            ),
-            audio_format=AudioFormat(encoding="pcm_s16le", chunk_size=4096, sample_rate=16000),
+            transcription_config=_transcription_config(source_lang),
+            audio_format=_AUDIO_FORMAT,
         )
-        await ws.send_json({"type": "session_started", "data": {"status": "connected"}})
+        await ws.send_text(_SESSION_STARTED)
+        writer.start()
+
+        # Small binary frames are accumulated so send_audio runs once per AUDIO_CHUNK_BYTES, not per frame
+        pcm_buffer = bytearray()
 
         while True:
+            # Generic receive() since audio may be binary or JSON text
             message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Binary frame: raw PCM from the client, no JSON or base64
+            if message.get("bytes"):
+                pcm_buffer += message["bytes"]
+                ready = len(pcm_buffer) - len(pcm_buffer) % AUDIO_CHUNK_BYTES
+                if ready:
+                    # One copy out of the buffer; the view must be released before the buffer is resized
+                    with memoryview(pcm_buffer) as view:
+                        chunk = bytes(view[:ready])
+                    del pcm_buffer[:ready]
+                    await client.send_audio(chunk)
+                continue
+
             if "text" not in message:
                 continue
-            data = json.loads(message["text"])
+
+            data = orjson.loads(message["text"])
             if data.get("type") == "audio_chunk":
-                audio = base64.b64decode(data.get("audio_base_64", ""))
+                audio = a2b_base64(data.get("audio_base_64", ""))
+                if pcm_buffer:
+                    pcm_buffer += audio
+                    audio = bytes(pcm_buffer)
+                    pcm_buffer.clear()
                 await client.send_audio(audio)
             elif data.get("type") == "end_stream":
-                print("🛑 Stream ended")
+                if pcm_buffer:
+                    await client.send_audio(bytes(pcm_buffer))
+                    pcm_buffer.clear()
+                logger.info("🛑 Stream ended")
                 for speaker_id, pipeline in sorted(pipelines.items()):
-                    print(f"  🎤 {speaker_id}: confirmed={pipeline.translator.translated_confirmed}")
+                    logger.debug("  🎤 %s: confirmed=%s", speaker_id, pipeline.translator.translated_confirmed)
                 break
 
     except WebSocketDisconnect:
-        print("👋 Disconnected")
+        logger.info("👋 Disconnected")
     except Exception as e:
-        print(f"❌ {type(e).__name__}: {e}")
+        logger.error("❌ %s: %s", type(e).__name__, e)
     finally:
         closed = True
+        cancel_pending_partial()
+        await writer.close()
         await client.__aexit__(None, None, None)
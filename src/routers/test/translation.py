@@ -4,6 +4,7 @@ Translation test suite.
 Change RUN_TEST below to select which test to run:
   "latency"  — 3-round latency comparison: Realtime vs DeepL full vs DeepL bare
   "quality"  — Side-by-side quality comparison: DeepL full vs GPT Realtime
+  "parallel" — Concurrent throughput: Realtime vs DeepL full, PARALLEL_CONCURRENCY translators side by side
 """
 
 RUN_TEST = "quality"
@@ -11,6 +12,8 @@ RUN_TEST = "quality"
 import os
 import json
 import time
+import asyncio
+from functools import partial
 
 from utils.translation_realtime import RealtimeTranslator
 from utils.translation_deepl import DeepLTranslator, DEEPL_API_KEY, DEEPL_BASE_URL, CUSTOM_INSTRUCTIONS
@@ -19,14 +22,16 @@ from utils.tone import TONE_INSTRUCTIONS_KOREAN, DEFAULT_TONE
 DATASET_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "dataset", "cs50_confirmed.json")
 TARGET_LANG = "Korean"
 NUM_ROUNDS = 3
+PARALLEL_CONCURRENCY = 8
 
 
-def load_dataset() -> list[dict]:
+def load_dataset() -> tuple[dict, ...]:
+    """Load once per test; a tuple so no run can mutate it for the next."""
     with open(DATASET_PATH) as f:
-        return json.load(f)
+        return tuple(json.load(f))
 
 
-async def run_translator(name: str, translator, sentences: list[dict]) -> list[dict]:
+async def run_translator(name: str, translator, sentences: tuple[dict, ...]) -> list[dict]:
     """Run all sentences through a translator and collect timing results."""
     results = []
 
@@ -47,7 +52,26 @@ async def run_translator(name: str, translator, sentences: list[dict]) -> list[d
     return results
 
 
-async def run_deepl_bare(translator, sentences: list[dict]) -> list[dict]:
+async def run_translator_parallel(name: str, make_translator, sentences: tuple[dict, ...], concurrency: int = PARALLEL_CONCURRENCY) -> list[dict]:
+    """Split sentences into `concurrency` contiguous slices, each run in order on its own translator.
+
+    A translator keeps context from the sentences before, so concurrent calls on one instance
+    would race on it. With one per slice, only each slice's first sentence lacks that context.
+    """
+    size = max(1, -(-len(sentences) // concurrency))
+
+    async def run_slice(part: tuple[dict, ...]) -> list[dict]:
+        translator = make_translator()
+        try:
+            return await run_translator(name, translator, part)
+        finally:
+            await translator.close()
+
+    parts = await asyncio.gather(*(run_slice(sentences[i:i + size]) for i in range(0, len(sentences), size)))
+    return [r for part in parts for r in part]
+
+
+async def run_deepl_bare(translator, sentences: tuple[dict, ...]) -> list[dict]:
     """Run DeepL with no context, no custom_instructions, latency_optimized only."""
     results = []
 
@@ -69,13 +93,14 @@ async def run_deepl_bare(translator, sentences: list[dict]) -> list[dict]:
 
 def compute_stats(latencies: list[float]) -> dict:
     s = sorted(latencies)
+    total = sum(s)
     return {
-        "avg": sum(s) / len(s),
+        "avg": total / len(s),
         "p50": s[len(s) // 2],
         "p90": s[int(len(s) * 0.9)],
         "min": s[0],
         "max": s[-1],
-        "total": sum(s),
+        "total": total,
     }
 
 
@@ -155,18 +180,40 @@ async def test_latency():
         print(f"  {metric.upper():<12} {rt_val:>10.0f}ms {dl_val:>10.0f}ms {bare_val:>10.0f}ms")
 
 
-async def run_with_translations(name: str, translator, sentences: list[dict]) -> list[dict]:
+async def test_parallel():
+    """Concurrent throughput: Realtime vs DeepL full, PARALLEL_CONCURRENCY requests in flight."""
+    dataset = load_dataset()
+    print(f"Loaded {len(dataset)} sentences from CS50 dataset")
+    print(f"Target language: {TARGET_LANG}")
+    print(f"Concurrency: {PARALLEL_CONCURRENCY} translators, each on a contiguous slice of the dataset")
+    print("Note: the first sentence of each slice is translated without prior context,")
+    print("so prompts (and latency/quality) differ slightly from the sequential tests\n")
+
+    for name, make_translator in [
+        ("RealtimeTranslator", partial(RealtimeTranslator, target_lang=TARGET_LANG)),
+        ("DeepL (full)", partial(DeepLTranslator, target_lang=TARGET_LANG)),
+    ]:
+        t_start = time.monotonic()
+        results = await run_translator_parallel(name, make_translator, dataset)
+        wall_ms = (time.monotonic() - t_start) * 1000
+        print_round_results(name, 1, results)
+        print(f"    Wall: {wall_ms:.0f}ms for {len(results)} sentences")
+
+
+async def run_with_translations(name: str, translator, sentences: tuple[dict, ...]) -> list[dict]:
     """Run all sentences through translate_confirmed and capture translations + timing."""
     results = []
+    captured = {"translation": ""}
+
+    async def capture(translated, _elapsed_ms):
+        captured["translation"] = translated
+
+    translator.on_confirmed = capture
     for entry in sentences:
         text = entry["text"]
         elapsed_ms = entry.get("elapsed_ms", 0)
-        captured = {"translation": ""}
-
-        async def capture(translated, _elapsed_ms):
-            captured["translation"] = translated
+        captured["translation"] = ""
 
-        translator.on_confirmed = capture
         t_start = time.monotonic()
         await translator.translate_confirmed(text, elapsed_ms)
         latency_ms = (time.monotonic() - t_start) * 1000
@@ -233,6 +280,7 @@ async def run():
     tests = {
         "latency": test_latency,
         "quality": test_quality,
+        "parallel": test_parallel,
     }
     test_fn = tests.get(RUN_TEST)
     if not test_fn:
@@ -1,11 +1,15 @@
 """
 Basic WebSocket server boilerplate.
+
+Pass ?batch=1 to receive bursts of echoes as {"type": "batch", "items": [...]},
+and ?binary=1 to receive them as binary JSON frames.
 """
 
-import json
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from auth.config import AUTH_ENABLED
 from auth.dependencies import require_ws_auth
+from utils.ws_writer import WebSocketWriter
 
 router = APIRouter()
 
@@ -17,6 +21,12 @@ async def stream(ws: WebSocket):
     if AUTH_ENABLED and user is None:
         return
     print("✅ Client connected")
+    writer = WebSocketWriter(
+        ws,
+        batch=ws.query_params.get("batch", "0") == "1",
+        binary=ws.query_params.get("binary", "0") == "1",
+    )
+    writer.start()
 
     try:
         while True:
@@ -24,11 +34,11 @@ async def stream(ws: WebSocket):
 
             # Text message (JSON)
             if "text" in message:
-                data = json.loads(message["text"])
+                data = orjson.loads(message["text"])
                 print(f"📨 Received: {data}")
 
-                # Echo back
-                await ws.send_json({"type": "received", "data": data})
+                # Echo back through the writer so the receive loop never waits on the client
+                writer.send({"type": "received", "data": data})
 
             # Binary message
             elif "bytes" in message:
@@ -39,4 +49,5 @@ async def stream(ws: WebSocket):
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
+        await writer.close()
         print("🔌 Connection closed")
\ No newline at end of file
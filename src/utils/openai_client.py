@@ -0,0 +1,13 @@
+import os
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Single client shared by translation, summaries, tone detection and the splitter,
+# so every OpenAI call reuses one pooled HTTP/2 connection instead of one pool per module.
+oai = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32),
+    ),
+)
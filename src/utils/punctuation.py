@@ -1,9 +1,8 @@
-import os
 import re
+import json
 import asyncio
-from openai import AsyncOpenAI
-
-oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+import logging
+from utils.openai_client import oai
 
 WORD_THRESHOLD = 15
 TAIL_SKIP = 3  # skip last N words — they're unstable in STT partials
@@ -28,6 +27,8 @@ SPLIT_SCHEMA = {
 EXAMPLE_IN = "Some seem deeper like the uncanny feeling we get from recordings that make people from long ago"
 EXAMPLE_OUT = '{"part1": "Some seem deeper", "part2": "like the uncanny feeling we get from recordings that make people from long ago"}'
 
+logger = logging.getLogger(__name__)
+
 
 def _strip_punct(w: str) -> str:
     return w.rstrip(".,?!")
@@ -77,7 +78,7 @@ class SentenceSplitter:
             )
 
             result = response.output_text.strip()
-            print(f"🔤 Splitter GPT: '{result}'")
+            logger.debug("🔤 Splitter GPT: '%s'", result)
 
             # Parse part1 from structured JSON response
             split_word_count = self._parse_split(result, words)
@@ -85,21 +86,19 @@ class SentenceSplitter:
                 # Apply TAIL_SKIP guard
                 if split_word_count <= len(words) - TAIL_SKIP:
                     self._split_at = split_word_count - 1  # 0-indexed
-                    part1 = " ".join(words[:split_word_count])
-                    print(f"🔤 Split after word {split_word_count}: \"{part1}\"")
+                    logger.info("🔤 Split after word %d: \"%s\"", split_word_count, " ".join(words[:split_word_count]))
                 else:
-                    print(f"🔤 Split at {split_word_count} too close to tail, ignored")
+                    logger.debug("🔤 Split at %d too close to tail, ignored", split_word_count)
             else:
-                print("🔤 Could not parse split point")
+                logger.debug("🔤 Could not parse split point")
 
         except Exception as e:
-            print(f"🔤 Splitter error: {type(e).__name__}: {e}")
+            logger.error("🔤 Splitter error: %s: %s", type(e).__name__, e)
         finally:
             self._pending = False
 
     def _parse_split(self, result: str, words: list[str]) -> int | None:
         """Extract word count of part1 from structured JSON response."""
-        import json
         try:
             data = json.loads(result)
             part1 = data.get("part1", "").strip()
@@ -127,6 +126,10 @@ class SentenceSplitter:
             return len(part1_words)
         return None
 
+    def rebase(self, dropped: int):
+        """Shift the request snapshot after the caller drops confirmed words from the front."""
+        self._request_confirmed_count -= dropped
+
     def take_split(self, current_confirmed_count: int, current_remaining: list[str]) -> int | None:
         """Return number of words to confirm, or None.
 
@@ -138,7 +141,7 @@ class SentenceSplitter:
         if self._split_at is None:
             return None
         if current_confirmed_count != self._request_confirmed_count:
-            print(f"🔤 Split discarded (confirmed advanced {self._request_confirmed_count} → {current_confirmed_count})")
+            logger.debug("🔤 Split discarded (confirmed advanced %d → %d)", self._request_confirmed_count, current_confirmed_count)
             self._split_at = None
             return None
         if len(current_remaining) < self._request_len:
@@ -149,7 +152,8 @@ class SentenceSplitter:
             self._split_at = None
             return None
         if _strip_punct(current_remaining[rel_idx]).lower() != self._request_words[rel_idx].lower():
-            print(f"🔤 Split discarded (word changed: '{self._request_words[rel_idx]}' → '{_strip_punct(current_remaining[rel_idx])}')")
+            logger.debug("🔤 Split discarded (word changed: '%s' → '%s')",
+                         self._request_words[rel_idx], _strip_punct(current_remaining[rel_idx]))
             self._split_at = None
             return None
 
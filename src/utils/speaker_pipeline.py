@@ -1,6 +1,8 @@
 import re
 import time
 import asyncio
+import logging
+from collections import deque
 from utils.translation import Translator
 from utils.translation_realtime import RealtimeTranslator
 from utils.translation_deepl import DeepLTranslator
@@ -10,14 +12,25 @@ from utils.punctuation import SentenceSplitter
 CONFIRM_PUNCT_COUNT = 1
 PARTIAL_INTERVAL = 2
 SILENCE_CONFIRM_SEC = 3.0
+SENTENCE_BOUNDARY_RE = re.compile(r'[.?!]\s+\w')
+WORD_RE = re.compile(r'\S+')
+
+logger = logging.getLogger(__name__)
 
 
 class SpeakerPipeline:
     """Per-speaker sentence confirmation and translation pipeline."""
 
+    __slots__ = ("speaker_id", "confirmed_word_count", "_confirmed_prefix", "partial_count", "prev_text",
+                 "tone_detector", "confirm_punct_count", "use_splitter", "partial_interval", "splitter",
+                 "on_confirmed_transcript", "on_partial_transcript", "_silence_task", "_stream_start",
+                 "_awaiting_new_partial", "_partial_start_ts", "_last_partial_len", "_pending_partial",
+                 "_partial_task", "_transcripts", "_transcript_task", "_loop", "translator")
+
     def __init__(self, speaker_id: str, on_confirmed, on_partial, on_confirmed_transcript, on_partial_transcript, target_lang: str, tone_detector: ToneDetector, stream_start: float = 0.0, confirm_punct_count: int = CONFIRM_PUNCT_COUNT, use_splitter: bool = True, partial_interval: int = PARTIAL_INTERVAL, use_realtime: bool = False, use_deepl: bool = False, on_partial_delta=None):
         self.speaker_id = speaker_id
         self.confirmed_word_count = 0
+        self._confirmed_prefix: str | None = ""  # full_text up to the last confirmed word; None if unknown
         self.partial_count = 0
         self.prev_text = ""
         self.tone_detector = tone_detector
@@ -32,6 +45,11 @@ class SpeakerPipeline:
         self._awaiting_new_partial: bool = True  # True at start and after each confirmation
         self._partial_start_ts: float = 0.0      # Wall-clock time when current partial sequence began
         self._last_partial_len: int = 0          # Word count of last partial sent for translation
+        self._pending_partial: tuple[str, int] | None = None  # Latest partial waiting for translation
+        self._partial_task: asyncio.Task | None = None
+        self._transcripts: deque[tuple[bool, str, int]] = deque()  # (is_partial, text, elapsed) awaiting delivery
+        self._transcript_task: asyncio.Task | None = None
+        self._loop = asyncio.get_running_loop()  # pipelines are created inside the stream handler
         if use_deepl:
             TranslatorClass = DeepLTranslator
         elif use_realtime:
@@ -57,15 +75,15 @@ class SpeakerPipeline:
         elapsed = self._elapsed_ms()
         now = time.time()
         latency = (now - self._partial_start_ts) * 1000 if self._partial_start_ts else 0
-        print(f"⏱️  [{self.speaker_id}] CONFIRMED  ts={now:.3f}  elapsed={elapsed}ms  "
-              f"partial_to_confirm={latency:.0f}ms  label={label}")
-        print(f"✅ [{self.speaker_id}] {label}: \"{text}\" (elapsed={elapsed}ms)")
+        logger.debug("⏱️  [%s] CONFIRMED  ts=%.3f  elapsed=%dms  partial_to_confirm=%.0fms  label=%s",
+                     self.speaker_id, now, elapsed, latency, label)
+        logger.info("✅ [%s] %s: \"%s\" (elapsed=%dms)", self.speaker_id, label, text, elapsed)
         self._awaiting_new_partial = True
         self._last_partial_len = 0
-        loop = asyncio.get_event_loop()
-        loop.create_task(self.translator.translate_confirmed(text, elapsed))
+        self._pending_partial = None  # covers text that was just confirmed
+        self._loop.create_task(self.translator.translate_confirmed(text, elapsed))
         if self.on_confirmed_transcript:
-            loop.create_task(self.on_confirmed_transcript(text, elapsed))
+            self._queue_transcript(False, text, elapsed)
         self.partial_count = 0
 
     def feed(self, full_text: str):
@@ -75,10 +93,10 @@ class SpeakerPipeline:
         self.prev_text = full_text
 
         self.tone_detector.feed_text(full_text)
-        words = full_text.split()
-        remaining_words = words[self.confirmed_word_count:]
+        confirmed_before = self.confirmed_word_count
+        remaining_words = self._remaining_words(full_text)
         remaining_text = " ".join(remaining_words)
-        print(f"🎤 [{self.speaker_id}] Remaining: \"{remaining_text}\"")
+        logger.debug("🎤 [%s] Remaining: \"%s\"", self.speaker_id, remaining_text)
 
         # Sentence splitter: trigger async GPT if text is long and unpunctuated
         if self.splitter:
@@ -89,21 +107,27 @@ class SpeakerPipeline:
         if split_count:
             new_confirmed = " ".join(remaining_words[:split_count])
             self.confirmed_word_count += split_count
-            remaining_text = " ".join(words[self.confirmed_word_count:])
+            remaining_words = remaining_words[split_count:]
+            remaining_text = " ".join(remaining_words)
             self._confirm_sentence(new_confirmed, "confirmed (split)")
 
-        # Check for confirmed sentence via natural punctuation
-        matches = list(re.finditer(r'[.?!]\s+\w', remaining_text))
+        # Check for confirmed sentence via natural punctuation (only the last N boundaries matter)
+        matches = deque(SENTENCE_BOUNDARY_RE.finditer(remaining_text), maxlen=self.confirm_punct_count)
         if len(matches) >= self.confirm_punct_count:
-            cut_match = matches[-self.confirm_punct_count]
+            cut_match = matches[0]
             cut = cut_match.start() + 1
             new_confirmed = remaining_text[:cut].strip()
 
             if new_confirmed:
-                self.confirmed_word_count += len(new_confirmed.split())
-                remaining_text = " ".join(words[self.confirmed_word_count:])
+                confirmed_count = len(new_confirmed.split())
+                self.confirmed_word_count += confirmed_count
+                remaining_words = remaining_words[confirmed_count:]
+                remaining_text = " ".join(remaining_words)
                 self._confirm_sentence(new_confirmed, "confirmed")
 
+        if self.confirmed_word_count != confirmed_before:
+            self._set_confirmed_prefix(full_text)
+
         # Send partial transcript every update for live display
         if remaining_text and self.on_partial_transcript:
             elapsed = self._elapsed_ms()
@@ -111,35 +135,97 @@ class SpeakerPipeline:
             if self._awaiting_new_partial:
                 self._partial_start_ts = now
                 self._awaiting_new_partial = False
-                print(f"⏱️  [{self.speaker_id}] PARTIAL_START  ts={now:.3f}  elapsed={elapsed}ms")
+                logger.debug("⏱️  [%s] PARTIAL_START  ts=%.3f  elapsed=%dms", self.speaker_id, now, elapsed)
             else:
-                print(f"⏱️  [{self.speaker_id}] PARTIAL        ts={now:.3f}  elapsed={elapsed}ms")
-            loop = asyncio.get_event_loop()
-            loop.create_task(self.on_partial_transcript(remaining_text, elapsed))
+                logger.debug("⏱️  [%s] PARTIAL        ts=%.3f  elapsed=%dms", self.speaker_id, now, elapsed)
+            self._queue_transcript(True, remaining_text, elapsed)
 
         # Fire partial translation every N updates (skip ASR corrections — shorter than last partial)
         self.partial_count += 1
-        remaining_word_count = len(remaining_text.split()) if remaining_text else 0
+        remaining_word_count = len(remaining_words)
         if self.partial_count % self.partial_interval == 0 and remaining_text and remaining_word_count >= self._last_partial_len:
             self._last_partial_len = remaining_word_count
-            elapsed = self._elapsed_ms()
-            loop = asyncio.get_event_loop()
-            loop.create_task(self.translator.translate_partial(remaining_text, elapsed))
+            self._queue_partial(remaining_text, self._elapsed_ms())
 
         # Reset silence timer
         self._reset_silence_timer()
 
+    def trim(self, text: str) -> str:
+        """Drop confirmed words from the front of the caller's accumulated text.
+
+        Returns the shortened text to feed from now on; confirmed_word_count is rebased to match.
+        Call right after feed(text) so prev_text is the same text.
+        """
+        words = text.split()
+        dropped = min(self.confirmed_word_count, len(words))
+        self.confirmed_word_count -= dropped
+        if self.splitter:
+            self.splitter.rebase(dropped)
+        trimmed = " ".join(words[dropped:])
+        self.prev_text = trimmed
+        self._set_confirmed_prefix(trimmed)
+        return trimmed
+
+    def _remaining_words(self, full_text: str) -> list[str]:
+        """Unconfirmed words. Splits only the tail while the confirmed prefix is unchanged."""
+        prefix = self._confirmed_prefix
+        if prefix is not None and full_text.startswith(prefix):
+            end = len(prefix)
+            if end == 0 or end == len(full_text) or full_text[end].isspace():
+                return full_text[end:].split()
+        # Confirmed region was revised by the ASR: fall back to counting words
+        return full_text.split()[self.confirmed_word_count:]
+
+    def _set_confirmed_prefix(self, full_text: str):
+        end = 0
+        count = 0
+        for match in WORD_RE.finditer(full_text):
+            if count == self.confirmed_word_count:
+                break
+            end = match.end()
+            count += 1
+        self._confirmed_prefix = full_text[:end] if count == self.confirmed_word_count else None
+
+    def _queue_partial(self, text: str, elapsed: int):
+        """Latest-wins slot: one partial translation in flight, newer partials overwrite the pending one."""
+        self._pending_partial = (text, elapsed)
+        if self._partial_task is None or self._partial_task.done():
+            self._partial_task = self._loop.create_task(self._partial_worker())
+
+    async def _partial_worker(self):
+        while self._pending_partial:
+            text, elapsed = self._pending_partial
+            self._pending_partial = None
+            await self.translator.translate_partial(text, elapsed)
+
+    def _queue_transcript(self, is_partial: bool, text: str, elapsed: int):
+        """Transcripts go out in order on one worker; a partial replaces a partial still waiting behind it."""
+        if is_partial and self._transcripts and self._transcripts[-1][0]:
+            self._transcripts[-1] = (is_partial, text, elapsed)
+        else:
+            self._transcripts.append((is_partial, text, elapsed))
+        if self._transcript_task is None or self._transcript_task.done():
+            self._transcript_task = self._loop.create_task(self._transcript_worker())
+
+    async def _transcript_worker(self):
+        while self._transcripts:
+            is_partial, text, elapsed = self._transcripts.popleft()
+            if is_partial:
+                await self.on_partial_transcript(text, elapsed)
+            else:
+                await self.on_confirmed_transcript(text, elapsed)
+
     def _reset_silence_timer(self):
         if self._silence_task:
             self._silence_task.cancel()
-        self._silence_task = asyncio.get_event_loop().create_task(self._silence_confirm())
+        self._silence_task = self._loop.create_task(self._silence_confirm())
 
     async def _silence_confirm(self):
         await asyncio.sleep(SILENCE_CONFIRM_SEC)
-        words = self.prev_text.split()
-        remaining_words = words[self.confirmed_word_count:]
+        remaining_words = self._remaining_words(self.prev_text)
         remaining_text = " ".join(remaining_words)
         if not remaining_text:
             return
         self.confirmed_word_count += len(remaining_words)
+        self._set_confirmed_prefix(self.prev_text)
         self._confirm_sentence(remaining_text, "silence auto-confirm")
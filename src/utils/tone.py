@@ -1,8 +1,6 @@
-import os
 import asyncio
-from openai import AsyncOpenAI
-
-oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+import logging
+from utils.openai_client import oai
 
 DETECT_PROMPT = """Analyze this transcript from a live stream/video and determine the speaker's tone and register.
 
@@ -65,6 +63,8 @@ TONE_INSTRUCTIONS_BY_LANG = {
 
 DEFAULT_TONE = "casual_polite"
 
+logger = logging.getLogger(__name__)
+
 
 class ToneDetector:
     def __init__(self, target_lang: str = "Korean"):
@@ -106,13 +106,13 @@ class ToneDetector:
                 old = self.current_tone
                 self.current_tone = result
                 self.detected = True
-                print(f"🎭 Tone detected: {old} → {result} (from {len(self.word_buffer)}w)")
+                logger.info("🎭 Tone detected: %s → %s (from %dw)", old, result, len(self.word_buffer))
             else:
-                print(f"🎭 Tone detection unclear: '{result}', keeping {self.current_tone}")
+                logger.debug("🎭 Tone detection unclear: '%s', keeping %s", result, self.current_tone)
                 self._detecting = False  # Retry later
 
         except Exception as e:
-            print(f"🎭 Tone detection error: {e}")
+            logger.error("🎭 Tone detection error: %s", e)
             self._detecting = False
 
     def get_tone_instruction(self) -> str:
@@ -1,12 +1,12 @@
-import os
 import time
 import asyncio
-from openai import AsyncOpenAI
-
-oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+import logging
+from utils.openai_client import oai
 
 TARGET_LANG = "Korean"
 
+logger = logging.getLogger(__name__)
+
 SYSTEM_PROMPT = """You are a real-time subtitle translator for live audio. Translate to {lang}.
 
 The source text is auto-generated speech recognition, which may contain errors, mishearings, or awkward phrasing. Your job is to convey what the speaker *meant*, not to literally translate the raw transcript.
@@ -97,9 +97,9 @@ class Translator:
             new_summary = result.output_text.strip()
             if new_summary:
                 self.topic_summary = new_summary
-                print(f"📝 Summary: {new_summary}")
+                logger.info("📝 Summary: %s", new_summary)
         except Exception as e:
-            print(f"Summary error: {type(e).__name__}: {e}")
+            logger.error("Summary error: %s: %s", type(e).__name__, e)
 
     async def _call_gpt(self, text: str, label: str = "", context: str = "",
                         delta_cb=None, generation: int = 0, elapsed_ms: int = 0) -> str:
@@ -134,12 +134,12 @@ class Translator:
 
             total_ms = (time.monotonic() - t_start) * 1000
             ttft_str = f"{ttft:.0f}" if ttft is not None else "n/a"
-            print(f"🌐 [{label}] ttft:{ttft_str}ms total:{total_ms:.0f}ms")
-            print(f"    Source: {text}")
-            print(f"    Result: {translated.strip()}")
+            logger.info("🌐 [%s] ttft:%sms total:%.0fms", label, ttft_str, total_ms)
+            logger.debug("    Source: %s", text)
+            logger.debug("    Result: %s", translated.strip())
 
             return translated.strip()
 
         except Exception as e:
-            print(f"Translation error: {type(e).__name__}: {e}")
+            logger.error("Translation error: %s: %s", type(e).__name__, e)
             return ""
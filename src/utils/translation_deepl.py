@@ -1,17 +1,18 @@
 import os
 import time
 import asyncio
+import logging
 import httpx
-from openai import AsyncOpenAI
 from utils.tone import TONE_INSTRUCTIONS_KOREAN, TONE_INSTRUCTIONS_JAPANESE, TONE_INSTRUCTIONS_GENERIC, DEFAULT_TONE
 from utils.languages import TARGET_LANG_MAP, FORMALITY_SUPPORTED_LANGS, CUSTOM_INSTRUCTION_LANGS
 from utils.translation_realtime import RealtimeTranslator
-
-_oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from utils.openai_client import oai as _oai
 
 DEEPL_API_KEY = os.getenv("DEEPL_API_KEY", "")
 DEEPL_BASE_URL = os.getenv("DEEPL_BASE_URL", "https://api-free.deepl.com")
 
+logger = logging.getLogger(__name__)
+
 # Map tone detector results to DeepL formality
 TONE_TO_FORMALITY = {
     "casual": "prefer_less",
@@ -159,14 +160,14 @@ class DeepLTranslator:
             translated = data["translations"][0]["text"]
 
             total_ms = (time.monotonic() - t_start) * 1000
-            print(f"🌐 [{label}] total:{total_ms:.0f}ms (deepl/{model_type})")
-            print(f"    Source: {text}")
-            print(f"    Result: {translated}")
+            logger.info("🌐 [%s] total:%.0fms (deepl/%s)", label, total_ms, model_type)
+            logger.debug("    Source: %s", text)
+            logger.debug("    Result: %s", translated)
 
             return translated
 
         except Exception as e:
-            print(f"DeepL error: {type(e).__name__}: {e}")
+            logger.error("DeepL error: %s: %s", type(e).__name__, e)
             return ""
 
     def _update_summary_async(self):
@@ -185,9 +186,9 @@ class DeepLTranslator:
             new_summary = result.output_text.strip()
             if new_summary:
                 self.topic_summary = new_summary
-                print(f"📝 Summary: {new_summary}")
+                logger.info("📝 Summary: %s", new_summary)
         except Exception as e:
-            print(f"Summary error: {type(e).__name__}: {e}")
+            logger.error("Summary error: %s: %s", type(e).__name__, e)
 
     async def close(self):
         await self._rt.close()
@@ -1,11 +1,10 @@
 import os
-import json
 import time
 import asyncio
+import logging
+import orjson
 import websockets
-from openai import AsyncOpenAI
-
-_oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from utils.openai_client import oai as _oai
 
 SYSTEM_PROMPT = """You are a real-time subtitle translator for live audio. Translate to {lang}.
 
@@ -25,6 +24,8 @@ Transcript:
 
 Summary:"""
 
+logger = logging.getLogger(__name__)
+
 
 class _ResponseTracker:
     __slots__ = ("label", "source", "future", "text", "ttft", "start_time",
@@ -34,7 +35,7 @@ class _ResponseTracker:
                  generation: int = 0, elapsed_ms: int = 0, translator=None):
         self.label = label
         self.source = source
-        self.future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
         self.text = ""
         self.ttft: float | None = None
         self.start_time = time.monotonic()
@@ -89,17 +90,17 @@ class RealtimeTranslator:
             },
         )
         # Configure session: text-only
-        await self._ws.send(json.dumps({
+        await self._ws.send(orjson.dumps({
             "type": "session.update",
             "session": {
                 "modalities": ["text"],
                 "temperature": 0.6,
                 "max_response_output_tokens": 200,
             }
-        }))
+        }), text=True)
         self._reader_task = asyncio.create_task(self._read_loop())
         self._connected = True
-        print("🔌 Realtime API WebSocket connected")
+        logger.info("🔌 Realtime API WebSocket connected")
 
     def _build_instructions(self) -> str:
         prompt = SYSTEM_PROMPT.format(lang=self.target_lang)
@@ -136,14 +137,15 @@ class RealtimeTranslator:
             new_summary = result.output_text.strip()
             if new_summary:
                 self.topic_summary = new_summary
-                print(f"📝 Summary: {new_summary}")
+                logger.info("📝 Summary: %s", new_summary)
         except Exception as e:
-            print(f"Summary error: {type(e).__name__}: {e}")
+            logger.error("Summary error: %s: %s", type(e).__name__, e)
 
     async def _read_loop(self):
         try:
-            async for raw in self._ws:
-                event = json.loads(raw)
+            while True:
+                # Raw bytes: orjson validates UTF-8 while parsing, so skip websockets' decode pass
+                event = orjson.loads(await self._ws.recv(decode=False))
                 t = event.get("type", "")
 
                 if t == "response.created":
@@ -179,25 +181,27 @@ class RealtimeTranslator:
                     if tracker and not tracker.future.done():
                         total = (time.monotonic() - tracker.start_time) * 1000
                         ttft_str = f"{tracker.ttft:.0f}" if tracker.ttft else "n/a"
-                        print(f"🌐 [{tracker.label}] ttft:{ttft_str}ms total:{total:.0f}ms")
-                        print(f"    Source: {tracker.source}")
-                        print(f"    Result: {tracker.text.strip()}")
+                        logger.info("🌐 [%s] ttft:%sms total:%.0fms", tracker.label, ttft_str, total)
+                        logger.debug("    Source: %s", tracker.source)
+                        logger.debug("    Result: %s", tracker.text.strip())
                         tracker.future.set_result(tracker.text.strip())
 
                 elif t == "error":
                     error = event.get("error", {})
-                    print(f"❌ Realtime API error: {error.get('message', error)}")
+                    logger.error("❌ Realtime API error: %s", error.get("message", error))
 
                 elif t == "session.created":
-                    print("✅ Realtime session created")
+                    logger.debug("✅ Realtime session created")
 
                 elif t == "session.updated":
-                    print("✅ Realtime session updated")
+                    logger.debug("✅ Realtime session updated")
 
+        except websockets.ConnectionClosedOK:
+            pass
         except websockets.ConnectionClosed as e:
-            print(f"❌ Realtime WebSocket closed: {e}")
+            logger.warning("❌ Realtime WebSocket closed: %s", e)
         except Exception as e:
-            print(f"❌ Realtime reader error: {type(e).__name__}: {e}")
+            logger.error("❌ Realtime reader error: %s: %s", type(e).__name__, e)
         finally:
             self._connected = False
             for tracker in self._response_map.values():
@@ -221,7 +225,7 @@ class RealtimeTranslator:
 
         async with self._send_lock:
             await self._creation_queue.put(tracker)
-            await self._ws.send(json.dumps({
+            await self._ws.send(orjson.dumps({
                 "type": "response.create",
                 "response": {
                     "modalities": ["text"],
@@ -235,7 +239,7 @@ class RealtimeTranslator:
                         }
                     ]
                 }
-            }))
+            }), text=True)
 
         return await tracker.future
 
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from collections import deque
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocketState
+
+COALESCE_SEC = 0.002  # window for gathering a burst of messages into one batch frame
+MAX_PENDING = 256  # past this backlog, a new partial evicts the queued ones it supersedes
+CLOSE_DRAIN_SEC = 1.0  # how long close() waits for already-queued messages to go out
+# Each of these carries the full current text, so a newer one replaces an older one of the
+# same type and speaker without losing anything.
+# Deltas and confirmed messages are never dropped.
+_DROPPABLE_TYPES = frozenset({"partial", "partial_transcript", "partial_translation"})
+
+logger = logging.getLogger(__name__)
+
+
+async def send_json(ws: WebSocket, payload: dict, binary: bool = False):
+    """Send JSON encoded with orjson instead of Starlette's json.dumps.
+
+    binary=True ships the orjson bytes as a binary frame, skipping the str round trip.
+    """
+    if binary:
+        await ws.send_bytes(orjson.dumps(payload))
+    else:
+        await ws.send_text(orjson.dumps(payload).decode())
+
+
+def _drop_superseded(items: list[dict]) -> list[dict]:
+    """Keep only the last partial per (type, speaker); everything else keeps its place."""
+    seen = set()
+    kept = []
+    for item in reversed(items):
+        msg_type = item.get("type")
+        if msg_type in _DROPPABLE_TYPES:
+            key = (msg_type, item.get("speaker"))
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(item)
+    kept.reverse()
+    return kept
+
+
+class WebSocketWriter:
+    """Per-connection outbound queue drained by a single writer task.
+
+    send() enqueues and returns immediately, so transcript/translation callbacks
+    never block on the client socket. With batch=True, messages queued within
+    COALESCE_SEC go out as one {"type": "batch", "items": [...]} frame, carrying only
+    the latest partial per type and speaker.
+    With binary=True, frames are sent as UTF-8 JSON bytes instead of text.
+    When a slow client lets MAX_PENDING messages back up, each new partial evicts every
+    queued partial of the same type and speaker, so only the latest one still goes out.
+    close() flushes what is already queued (up to CLOSE_DRAIN_SEC) before stopping.
+    """
+
+    __slots__ = ("ws", "batch", "binary", "closed", "_pending", "_wakeup", "_task")
+
+    def __init__(self, ws: WebSocket, batch: bool = False, binary: bool = False):
+        self.ws = ws
+        self.batch = batch
+        self.binary = binary
+        self.closed = False
+        self._pending: deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: dict):
+        if self.closed:
+            return
+        if len(self._pending) >= MAX_PENDING and payload.get("type") in _DROPPABLE_TYPES:
+            self._evict_superseded(payload)
+        self._pending.append(payload)
+        self._wakeup.set()
+
+    def _evict_superseded(self, payload: dict):
+        """Remove every queued message of the same type and speaker as payload."""
+        msg_type = payload.get("type")
+        speaker = payload.get("speaker")
+        kept = [queued for queued in self._pending
+                if queued.get("type") != msg_type or queued.get("speaker") != speaker]
+        if len(kept) != len(self._pending):
+            # In place: the writer task holds a reference to this deque
+            self._pending.clear()
+            self._pending.extend(kept)
+
+    async def _run(self):
+        pending = self._pending
+        try:
+            while True:
+                if not pending:
+                    if self.closed:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                if not self.batch:
+                    await send_json(self.ws, pending.popleft(), self.binary)
+                    continue
+
+                await asyncio.sleep(COALESCE_SEC)
+                items = _drop_superseded(list(pending))
+                pending.clear()
+                if len(items) == 1:
+                    await send_json(self.ws, items[0], self.binary)
+                else:
+                    await send_json(self.ws, {"type": "batch", "items": items}, self.binary)
+        except Exception as e:
+            if self._disconnected(e):
+                logger.debug("WebSocket writer stopped, client disconnected: %s: %s", type(e).__name__, e)
+            else:
+                logger.error("WebSocket writer error: %s: %s", type(e).__name__, e)
+        finally:
+            self.closed = True
+
+    def _disconnected(self, error: Exception) -> bool:
+        """Whether a send failed because the client went away (routine) rather than a bug."""
+        if isinstance(error, WebSocketDisconnect):
+            return True
+        # Starlette raises RuntimeError for sends after either side has closed
+        return isinstance(error, RuntimeError) and WebSocketState.DISCONNECTED in (
+            self.ws.client_state, self.ws.application_state)
+
+    async def close(self):
+        if self._task is None:
+            self.closed = True
+            return
+        try:
+            if not self.closed:
+                self.closed = True
+                self._wakeup.set()
+                # Let the final confirmed messages reach the client, but don't wait on a stalled one
+                await asyncio.wait((self._task,), timeout=CLOSE_DRAIN_SEC)
+        finally:
+            # Also runs if the handler is cancelled mid-drain, so the writer never outlives it
+            self.closed = True
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
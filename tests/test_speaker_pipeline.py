@@ -0,0 +1,87 @@
+import os
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENAI_API_KEY", "test")  # utils.openai_client builds its client at import
+
+from utils import punctuation, speaker_pipeline  # noqa: E402
+
+WORDS = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa quebec".split()
+
+
+class _Translator:
+    def __init__(self, **kwargs):
+        pass
+
+    async def translate_confirmed(self, text, elapsed_ms):
+        pass
+
+    async def translate_partial(self, text, elapsed_ms):
+        pass
+
+
+class _ToneDetector:
+    def feed_text(self, text):
+        pass
+
+
+class _Responses:
+    async def create(self, **kwargs):
+        return SimpleNamespace(output_text='{"part1": "alpha bravo charlie delta echo", "part2": "foxtrot"}')
+
+
+class TrimTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(speaker_pipeline, "Translator", _Translator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(punctuation, "oai", SimpleNamespace(responses=_Responses()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.confirmed = []
+
+        async def on_confirmed_transcript(text, elapsed_ms=0):
+            self.confirmed.append(text)
+
+        async def noop(*args, **kwargs):
+            pass
+
+        self.pipeline = speaker_pipeline.SpeakerPipeline(
+            speaker_id="S1",
+            on_confirmed=noop,
+            on_partial=noop,
+            on_confirmed_transcript=on_confirmed_transcript,
+            on_partial_transcript=noop,
+            target_lang="Korean",
+            tone_detector=_ToneDetector(),
+        )
+
+    async def asyncTearDown(self):
+        self.pipeline._silence_task.cancel()
+
+    async def test_trim_keeps_pending_split(self):
+        pipeline = self.pipeline
+        text = "First one. " + " ".join(WORDS[:-1])
+        pipeline.feed(text)  # confirms "First one."
+        text += " " + WORDS[-1]
+        pipeline.feed(text)  # long unpunctuated tail: split requested
+        await asyncio.sleep(0)
+        self.assertIsNotNone(pipeline.splitter._split_at)
+
+        text = pipeline.trim(text)
+        self.assertEqual(pipeline.confirmed_word_count, 0)
+        pipeline.feed(text + " romeo")
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.confirmed, ["First one.", "alpha bravo charlie delta echo"])
+        self.assertEqual(pipeline.confirmed_word_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import sys
+import random
+import asyncio
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENAI_API_KEY", "test")  # utils.openai_client builds its client at import
+
+from speechmatics.rt import ServerMessageType  # noqa: E402
+from routers.stt import speechmatics  # noqa: E402
+
+
+class _FakeClient:
+    """Stands in for speechmatics.rt.AsyncClient: records audio, exposes registered handlers."""
+
+    last: "_FakeClient | None" = None
+
+    def __init__(self, api_key=None):
+        self.handlers = {}
+        self.audio: list[bytes] = []
+        _FakeClient.last = self
+
+    def on(self, event):
+        def register(fn):
+            self.handlers[event] = fn
+            return fn
+        return register
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def start_session(self, **kwargs):
+        pass
+
+    async def send_audio(self, audio: bytes):
+        self.audio.append(audio)
+
+
+class _StubWebSocket:
+    query_params = {}
+
+    def __init__(self):
+        self.incoming: asyncio.Queue[dict] = asyncio.Queue()
+        self.sent: list[dict] = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self) -> dict:
+        return await self.incoming.get()
+
+    async def send_text(self, text: str):
+        self.sent.append(orjson.loads(text))
+
+
+class _StubPipeline:
+    def __init__(self, **kwargs):
+        self.confirmed_word_count = 0
+        self.feeds: list[str] = []
+
+    def feed(self, text: str):
+        self.feeds.append(text)
+
+
+def _transcript(kind: ServerMessageType, text: str, speaker: str = "S1") -> dict:
+    results = [
+        {"type": "word", "start_time": 0.0, "end_time": 1.0,
+         "alternatives": [{"content": word, "speaker": speaker, "confidence": 1.0}]}
+        for word in text.split()
+    ]
+    return {"message": kind.value, "metadata": {"transcript": text, "start_time": 0.0, "end_time": 1.0}, "results": results}
+
+
+class StreamTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        for target, value in [
+            ("AsyncClient", _FakeClient),
+            ("SpeakerPipeline", _StubPipeline),
+            ("ToneDetector", mock.Mock()),
+            ("AUTH_ENABLED", False),
+            ("require_ws_auth", mock.AsyncMock(return_value=None)),
+        ]:
+            patcher = mock.patch.object(speechmatics, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.ws = _StubWebSocket()
+        self.task = asyncio.create_task(speechmatics.stream(self.ws))
+        await asyncio.sleep(0.01)  # let stream() register its handlers and start the session
+        self.client = _FakeClient.last
+
+    async def asyncTearDown(self):
+        if not self.task.done():
+            self.ws.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 2)
+
+    def partial(self, text: str):
+        self.client.handlers[ServerMessageType.ADD_PARTIAL_TRANSCRIPT](_transcript(ServerMessageType.ADD_PARTIAL_TRANSCRIPT, text))
+
+    def final(self, text: str):
+        self.client.handlers[ServerMessageType.ADD_TRANSCRIPT](_transcript(ServerMessageType.ADD_TRANSCRIPT, text))
+
+    def sent_partials(self) -> list[str]:
+        return [m["text"] for m in self.ws.sent if m.get("type") == "partial"]
+
+
+class PartialDebounceTest(StreamTest):
+    async def test_burst_sends_latest_once_after_window(self):
+        self.partial("one")  # first partial goes straight out
+        for text in ("one two", "one two three", "one two three four"):
+            self.partial(text)
+        await asyncio.sleep(speechmatics.PARTIAL_DEBOUNCE_SEC / 2)
+        self.assertEqual(self.sent_partials(), ["one"])
+
+        await asyncio.sleep(speechmatics.PARTIAL_DEBOUNCE_SEC)
+        self.assertEqual(self.sent_partials(), ["one", "one two three four"])
+
+    async def test_final_cancels_pending_partial(self):
+        self.partial("one")
+        self.partial("one two")  # held by the debounce
+        self.final("one two.")
+        await asyncio.sleep(speechmatics.PARTIAL_DEBOUNCE_SEC * 1.5)
+        self.assertEqual(self.sent_partials(), ["one"])
+
+
+class AudioAccumulatorTest(StreamTest):
+    async def test_binary_frames_sent_in_chunk_multiples(self):
+        rng = random.Random(0)
+        frames = [rng.randbytes(rng.randint(1, 3 * speechmatics.AUDIO_CHUNK_BYTES)) for _ in range(40)]
+        audio = b"".join(frames)
+        leftover = len(audio) % speechmatics.AUDIO_CHUNK_BYTES
+        self.assertTrue(leftover)
+
+        for frame in frames:
+            self.ws.incoming.put_nowait({"type": "websocket.receive", "bytes": frame})
+        await asyncio.sleep(0.01)
+        sends = list(self.client.audio)
+        self.assertTrue(all(type(chunk) is bytes for chunk in sends))
+        self.assertTrue(all(chunk and len(chunk) % speechmatics.AUDIO_CHUNK_BYTES == 0 for chunk in sends))
+        self.assertEqual(b"".join(sends), audio[:len(audio) - leftover])
+
+        # The held-back tail goes out on end_stream
+        self.ws.incoming.put_nowait({"type": "websocket.receive", "text": '{"type": "end_stream"}'})
+        await asyncio.wait_for(self.task, 2)
+        self.assertEqual(self.client.audio[len(sends):], [audio[-leftover:]])
+
+
+if __name__ == "__main__":
+    unittest.main()
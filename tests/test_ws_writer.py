@@ -0,0 +1,149 @@
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fastapi import WebSocketDisconnect  # noqa: E402
+from fastapi.websockets import WebSocketState  # noqa: E402
+from utils import ws_writer  # noqa: E402
+from utils.ws_writer import WebSocketWriter  # noqa: E402
+
+
+class _StubWebSocket:
+    """Records sent frames; clear `gate` to stall sends, set `fail` to make them raise."""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.fail: Exception | None = None
+        self.client_state = self.application_state = WebSocketState.CONNECTED
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        if self.fail:
+            raise self.fail
+        self.sent.append(orjson.loads(text))
+
+
+def _confirmed(i: int) -> dict:
+    return {"type": "confirmed_transcript", "speaker": "S1", "text": f"c{i}"}
+
+
+def _partial(i: int, speaker: str = "S1", msg_type: str = "partial_transcript") -> dict:
+    return {"type": msg_type, "speaker": speaker, "text": f"p{i}"}
+
+
+class WriterTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ws = _StubWebSocket()
+        self.writer = WebSocketWriter(self.ws)
+        self.writer.start()
+
+    async def asyncTearDown(self):
+        await self.writer.close()
+
+    async def test_ordered_delivery(self):
+        messages = [_confirmed(i) for i in range(20)]
+        for message in messages:
+            self.writer.send(message)
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.ws.sent, messages)
+
+    async def test_close_drains_queue(self):
+        self.ws.gate.clear()
+        messages = [_confirmed(i) for i in range(5)]
+        for message in messages:
+            self.writer.send(message)
+        asyncio.get_running_loop().call_later(0.05, self.ws.gate.set)
+        await self.writer.close()
+        self.assertEqual(self.ws.sent, messages)
+        self.writer.send(_confirmed(5))  # ignored once closed
+        self.assertEqual(len(self.ws.sent), 5)
+
+    async def test_close_gives_up_on_stalled_client(self):
+        self.ws.gate.clear()
+        self.writer.send(_confirmed(0))
+        with mock.patch.object(ws_writer, "CLOSE_DRAIN_SEC", 0.05):
+            await asyncio.wait_for(self.writer.close(), 1)
+        self.assertTrue(self.writer._task.done())
+        self.assertEqual(self.ws.sent, [])
+
+    async def test_cancel_during_drain_stops_writer(self):
+        self.ws.gate.clear()
+        self.writer.send(_confirmed(0))
+        closing = asyncio.create_task(self.writer.close())
+        await asyncio.sleep(0.01)
+        closing.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await closing
+        await asyncio.sleep(0)
+        self.assertTrue(self.writer._task.done())
+
+    async def test_overflow_evicts_superseded_partials(self):
+        self.ws.gate.clear()
+        self.writer.send(_confirmed(0))
+        await asyncio.sleep(0)  # c0 is now in flight, the rest queue up behind it
+        s1 = [_partial(i) for i in range(200)]
+        s2 = [_partial(i, "S2") for i in range(60)]
+        confirmed = [_confirmed(i) for i in range(1, 61)]
+        for message in [*s1, confirmed[0], *s2, *confirmed[1:]]:
+            self.writer.send(message)
+        latest = _partial(200)
+        self.writer.send(latest)
+        self.ws.gate.set()
+        await self.writer.close()
+
+        # S2 overflowed at q55 and S1 at p200: each evicted every older partial of its own key
+        self.assertEqual(self.ws.sent, [_confirmed(0), confirmed[0], *s2[55:], *confirmed[1:], latest])
+
+    async def test_send_failure_stops_loop(self):
+        self.ws.fail = ValueError("boom")
+        with self.assertLogs(ws_writer.logger, "ERROR"):
+            self.writer.send(_confirmed(0))
+            await asyncio.sleep(0.01)
+        self.assertTrue(self.writer._task.done())
+        self.assertTrue(self.writer.closed)
+        self.writer.send(_confirmed(1))
+        self.assertEqual(self.ws.sent, [])
+
+    async def test_disconnect_is_not_an_error(self):
+        self.ws.fail = WebSocketDisconnect(1006)
+        with self.assertNoLogs(ws_writer.logger, "ERROR"), self.assertLogs(ws_writer.logger, "DEBUG"):
+            self.writer.send(_confirmed(0))
+            await asyncio.sleep(0.01)
+        self.assertTrue(self.writer._task.done())
+
+    async def test_send_after_close_is_not_an_error(self):
+        self.ws.fail = RuntimeError('Cannot call "send" once a close message has been sent.')
+        self.ws.application_state = WebSocketState.DISCONNECTED
+        with self.assertNoLogs(ws_writer.logger, "ERROR"), self.assertLogs(ws_writer.logger, "DEBUG"):
+            self.writer.send(_confirmed(0))
+            await asyncio.sleep(0.01)
+        self.assertTrue(self.writer._task.done())
+
+
+class BatchWriterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_keeps_latest_partial_per_speaker(self):
+        ws = _StubWebSocket()
+        writer = WebSocketWriter(ws, batch=True)
+        writer.start()
+        messages = [
+            _partial(0), _partial(0, "S2"), _partial(1), _confirmed(0),
+            _partial(0, msg_type="partial_translation"), _partial(2), _partial(1, "S2"),
+        ]
+        for message in messages:
+            writer.send(message)
+        await writer.close()
+        self.assertEqual(ws.sent, [{"type": "batch", "items": [
+            _confirmed(0), _partial(0, msg_type="partial_translation"), _partial(2), _partial(1, "S2"),
+        ]}])
+
+
+if __name__ == "__main__":
+    unittest.main()